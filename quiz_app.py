@@ -1,17 +1,118 @@
+import time
+_import_start = time.perf_counter()
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import sys
-import subprocess
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import OrderedDict
 import random
-import json
+import threading
+
+# Medições de tempo da inicialização (exibidas com --profile-startup)
+startup_timings = [("Importações iniciais", time.perf_counter() - _import_start)]
+deferred_timings = []  # Etapas executadas depois que a primeira tela é desenhada
+
+# Módulos pesados carregados sob demanda (ver warm_up_plotting e load_plotting)
+plt = None
+FigureCanvasTkAgg = None
+plotting_error = None  # Falha ao importar o matplotlib na thread de aquecimento
+
+ATTEMPTS_FILE = "quiz_attempts.txt"
+SESSION_CACHE_SIZE = 8  # Sessões pré-geradas mantidas para os temas usados recentemente
+SESSION_FORMAT = "1"  # Versão do algoritmo de embaralhamento gravada em cada tentativa
+
+def record_timing(label, start, timings=startup_timings):
+    """Registra o tempo gasto numa etapa da inicialização."""
+    timings.append((label, time.perf_counter() - start))
+
+def print_startup_profile():
+    """Imprime o detalhamento dos tempos de inicialização."""
+    print("Tempos de inicialização:")
+    for timings, subtotal in ((startup_timings, "Até a primeira tela"),
+                              (deferred_timings, "Tarefas adiadas")):
+        for label, elapsed in timings:
+            print(f"  {label:<35} {elapsed * 1000:8.1f} ms")
+        print(f"  {subtotal:<35} {sum(t for _, t in timings) * 1000:8.1f} ms")
+
+def warm_up_plotting():
+    """Importa o matplotlib.pyplot numa thread à parte, guardando o tempo e eventuais erros."""
+    global plotting_error
+    start = time.perf_counter()
+    try:
+        import matplotlib.pyplot
+    except Exception as e:
+        plotting_error = e
+    record_timing("Importação do matplotlib (thread)", start, deferred_timings)
+
+def load_plotting():
+    """Completa a importação do matplotlib, com o backend Tk, quando os gráficos forem necessários."""
+    global plt, FigureCanvasTkAgg
+    if plotting_error is not None:
+        raise plotting_error
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+        plt, FigureCanvasTkAgg = pyplot, canvas_class
+
+def read_question_bank(json_file):
+    """Lê um banco de perguntas e retorna (dados, hash do conteúdo do arquivo)."""
+    import hashlib
+    import json
+    with open(json_file, "rb") as f:
+        content = f.read()
+    return json.loads(content.decode("utf-8")), hashlib.sha256(content).hexdigest()[:16]
+
+def new_session_seed():
+    """Sorteia a semente de uma nova sessão."""
+    return random.getrandbits(32)
+
+def generate_session(questions, seed):
+    """Embaralha uma cópia das perguntas de forma reproduzível a partir da semente.
+
+    Usa um Fisher-Yates próprio guiado apenas por random(), cuja sequência para uma
+    mesma semente é garantida entre versões do Python (random.shuffle não é).
+    Qualquer mudança aqui exige um novo SESSION_FORMAT.
+    """
+    session = list(questions)
+    rng = random.Random(seed)
+    for i in range(len(session) - 1, 0, -1):
+        j = int(rng.random() * (i + 1))
+        session[i], session[j] = session[j], session[i]
+    return session
+
+def read_attempt_records(path=ATTEMPTS_FILE):
+    """Lê as tentativas salvas como dicionários 'campo: valor'."""
+    records = []
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            for attempt in f.read().split("---\n"):
+                if attempt.strip():
+                    record = {}
+                    for line in attempt.strip().split("\n"):
+                        key, _, value = line.partition(": ")
+                        record[key.strip()] = value.strip()
+                    records.append(record)
+    return records
+
+def rebuild_session(record):
+    """Reconstrói a ordem exata das perguntas de uma tentativa a partir do seu registro."""
+    if "Semente" not in record:
+        raise ValueError("Esta tentativa foi salva sem semente e não pode ser reconstruída.")
+    if record.get("Formato da Sessão") != SESSION_FORMAT:
+        raise ValueError("Esta tentativa usa um formato de sessão desconhecido.")
+    bank, bank_hash = read_question_bank(record["Arquivo"])
+    if bank_hash != record["Hash do Banco"]:
+        raise ValueError(f"O arquivo '{record['Arquivo']}' mudou desde esta tentativa.")
+    questions = bank[record["Dificuldade"]][record["Tema"]][record["Modo"]]
+    return generate_session(questions, int(record["Semente"]))
 
 class QuizApp:
-    def __init__(self, root):
+    def __init__(self, root, profile_startup=False, fixed_seed=None):
         # Configuração inicial da janela
+        start = time.perf_counter()
+        self.profile_startup = profile_startup
+        self.fixed_seed = fixed_seed  # Semente informada com --seed, usada em todas as sessões
         self.root = root
         self.root.title("Aventura de Quiz")
         self.root.geometry("800x600")
@@ -36,10 +137,14 @@ class QuizApp:
         self.total_questions = 0
         self.stats = {"correct": [], "wrong": []}
         self.pdf_files = []
-        self.attempts = self.load_previous_attempts()
+        self.attempts = None  # Carregado após a primeira tela (ver deferred_startup)
         self.current_mode = None  # 'open' para resposta aberta, 'multiple' para múltipla escolha
         self.current_difficulty = None  # 'Iniciante', 'Estudado', 'Pronto para a Prova'
         self.current_json_file = None  # Arquivo JSON selecionado
+        self.current_bank_hash = None  # Hash do arquivo JSON selecionado
+        self.current_quiz_name = None  # Tema em andamento
+        self.session_seed = None  # Semente que gerou a ordem das perguntas atuais
+        self.session_cache = OrderedDict()  # Próximas sessões pré-geradas (LRU)
         self.selected_answer = tk.StringVar()  # Para armazenar a escolha no modo de múltipla escolha
         self.showing_stats = False  # Controle para alternar entre menu e estatísticas
         self.showing_mode = False  # Controle para alternar entre menu e seleção de modo
@@ -48,8 +153,8 @@ class QuizApp:
         self.showing_quiz_selection = False  # Controle para alternar entre seleção de tema
         self.showing_pdf_list = False  # Controle para alternar entre lista de PDFs
 
-        # Lista de arquivos JSON disponíveis
-        self.json_files = self.find_json_files()
+        # Lista de arquivos JSON disponíveis, descoberta após a primeira tela
+        self.json_files = None
 
         # Configuração da grade
         self.root.grid_rowconfigure(0, weight=1)
@@ -62,6 +167,58 @@ class QuizApp:
         # Tela inicial
         self.show_initial_screen()
         self.root.bind('<Configure>', self.on_resize)
+        record_timing("Criação dos widgets da tela inicial", start)
+
+        # Tarefas leves de arquivo rodam depois que a janela for desenhada
+        self.startup_steps = [
+            ("Carregamento do histórico", self.ensure_attempts_loaded),
+            ("Busca de arquivos de quiz", self.ensure_json_files),
+            ("Pré-geração das sessões recentes", self.warm_session_cache),
+        ]
+        self.widgets_built_at = time.perf_counter()
+        self.root.bind('<Expose>', self.on_first_expose)
+
+        # O matplotlib.pyplot é lento de importar e não cria widgets: aquece numa thread à parte.
+        # A thread não é daemon para não ser interrompida no meio da importação ao fechar a janela.
+        self.plotting_thread = threading.Thread(target=warm_up_plotting)
+        self.plotting_thread.start()
+
+    def on_first_expose(self, event):
+        """Inicia as etapas adiadas quando a janela principal é desenhada pela primeira vez."""
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Expose>')
+        record_timing("Exibição e desenho da janela", self.widgets_built_at)
+        # O redesenho agendado pelo Expose roda antes deste callback ocioso
+        self.root.after_idle(self.deferred_startup)
+
+    def deferred_startup(self):
+        """Executa uma etapa adiada da inicialização por vez, sem travar a janela."""
+        if self.startup_steps:
+            label, step = self.startup_steps.pop(0)
+            start = time.perf_counter()
+            step()
+            record_timing(label, start, deferred_timings)
+            self.root.after_idle(self.deferred_startup)
+        elif self.profile_startup:
+            self.print_profile_when_ready()
+
+    def print_profile_when_ready(self):
+        """Imprime os tempos de inicialização assim que a importação do matplotlib terminar."""
+        if self.plotting_thread.is_alive():
+            self.root.after(100, self.print_profile_when_ready)
+        else:
+            print_startup_profile()
+
+    def ensure_attempts_loaded(self):
+        """Garante que o histórico de tentativas foi carregado."""
+        if self.attempts is None:
+            self.attempts = self.load_previous_attempts()
+
+    def ensure_json_files(self):
+        """Garante que a lista de arquivos de quiz foi montada."""
+        if self.json_files is None:
+            self.json_files = self.find_json_files()
 
     def find_json_files(self):
         """Encontra todos os arquivos .json com 'quiz' no nome na pasta atual."""
@@ -73,14 +230,13 @@ class QuizApp:
     def load_questions_from_json(self, json_file):
         """Carrega perguntas e respostas do arquivo JSON especificado."""
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                self.all_questions = json.load(f)
+            self.all_questions, self.current_bank_hash = read_question_bank(json_file)
         except FileNotFoundError:
             messagebox.showerror("Erro", f"Arquivo '{json_file}' não encontrado!")
-            self.all_questions = {}
-        except json.JSONDecodeError:
+            self.all_questions, self.current_bank_hash = {}, None
+        except ValueError:  # Inclui json.JSONDecodeError e UnicodeDecodeError
             messagebox.showerror("Erro", f"Erro ao ler o arquivo '{json_file}'. Verifique o formato!")
-            self.all_questions = {}
+            self.all_questions, self.current_bank_hash = {}, None
 
     # Configuração da interface
     def configure_styles(self):
@@ -171,6 +327,7 @@ class QuizApp:
     def show_json_selection(self):
         """Exibe a lista de arquivos JSON disponíveis na mesma janela."""
         if not self.showing_json_selection:
+            self.ensure_json_files()
             self.clear_frame()
             self.main_frame = ttk.Frame(self.root, padding="20")
             self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -340,14 +497,64 @@ class QuizApp:
         """Inicia o quiz selecionado."""
         if (self.current_difficulty in self.all_questions and 
             quiz_name in self.all_questions[self.current_difficulty]):
-            quizzes = self.all_questions[self.current_difficulty][quiz_name]
-            self.questions = quizzes[self.current_mode].copy()  # Cria uma cópia para evitar modificar o original
-            random.shuffle(self.questions)  # Embaralha as perguntas
+            pool = self.all_questions[self.current_difficulty][quiz_name][self.current_mode]
+            key = (self.current_json_file, self.current_bank_hash,
+                   self.current_difficulty, quiz_name, self.current_mode)
+            if self.fixed_seed is not None:
+                # Sessão compartilhada: mesma ordem para todos que usarem a mesma semente
+                session = (self.fixed_seed, generate_session(pool, self.fixed_seed))
+            else:
+                # Usa a sessão pré-gerada, se houver; senão gera uma agora
+                session = self.session_cache.pop(key, None)
+                if session is None:
+                    seed = new_session_seed()
+                    session = (seed, generate_session(pool, seed))
+                # Prepara a próxima sessão deste tema fora do caminho crítico
+                self.root.after_idle(lambda: self.pregenerate_session(key, pool))
+            self.session_seed, self.questions = session
+            self.current_quiz_name = quiz_name
             self.total_questions = len(self.questions)
             self.start_quiz()
         else:
             messagebox.showerror("Erro", "Nenhuma pergunta disponível para este tema e dificuldade!")
 
+    def warm_session_cache(self):
+        """Pré-gera sessões para os temas das tentativas mais recentes do histórico."""
+        try:
+            records = read_attempt_records()
+        except OSError:
+            return
+        recent = []
+        for record in reversed(records):
+            combo = tuple(record.get(k) for k in ("Arquivo", "Dificuldade", "Tema", "Modo"))
+            if None not in combo and combo not in recent:
+                recent.append(combo)
+                if len(recent) == SESSION_CACHE_SIZE:
+                    break
+
+        banks = {}
+        # Do mais antigo para o mais recente, para que o LRU descarte os antigos primeiro
+        for json_file, difficulty, quiz_name, mode in reversed(recent):
+            if json_file not in banks:
+                try:
+                    banks[json_file] = read_question_bank(json_file)
+                except (OSError, ValueError):
+                    banks[json_file] = None
+            if banks[json_file] is None:
+                continue
+            bank, bank_hash = banks[json_file]
+            pool = bank.get(difficulty, {}).get(quiz_name, {}).get(mode)
+            if pool:
+                self.pregenerate_session((json_file, bank_hash, difficulty, quiz_name, mode), pool)
+
+    def pregenerate_session(self, key, questions):
+        """Gera e guarda a próxima sessão de um tema, descartando a menos recente."""
+        seed = new_session_seed()
+        self.session_cache[key] = (seed, generate_session(questions, seed))
+        self.session_cache.move_to_end(key)
+        while len(self.session_cache) > SESSION_CACHE_SIZE:
+            self.session_cache.popitem(last=False)
+
     def create_quiz_frame(self):
         """Tela do quiz com perguntas e respostas."""
         self.clear_frame()
@@ -509,6 +716,7 @@ class QuizApp:
 
         percentage = (self.correct_answers / self.total_questions) * 100
         result_text = f"Quiz concluído!\nPontuação: {self.correct_answers}/{self.total_questions} ({percentage:.1f}%)"
+        result_text += f"\nSemente da sessão: {self.session_seed}"
 
         self.welcome_label = ttk.Label(self.main_frame, text="Obrigado por jogar!",
                                      anchor='center')
@@ -527,35 +735,39 @@ class QuizApp:
         """Salva a tentativa atual em um único arquivo."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         percentage = (self.correct_answers / self.total_questions) * 100
+        self.ensure_attempts_loaded()
         self.attempts.append((timestamp, percentage))
         
-        with open("quiz_attempts.txt", "a") as f:
+        with open(ATTEMPTS_FILE, "a") as f:
             f.write(f"Data: {timestamp}\n")
             f.write(f"Pontuação: {self.correct_answers}/{self.total_questions}\n")
             f.write(f"Porcentagem: {percentage:.1f}%\n")
             f.write(f"Corretas: {len(self.stats['correct'])}\n")
             f.write(f"Erradas: {len(self.stats['wrong'])}\n")
+            # Dados para reconstruir a ordem das perguntas (ver rebuild_session)
+            f.write(f"Arquivo: {self.current_json_file}\n")
+            f.write(f"Hash do Banco: {self.current_bank_hash}\n")
+            f.write(f"Dificuldade: {self.current_difficulty}\n")
+            f.write(f"Tema: {self.current_quiz_name}\n")
+            f.write(f"Modo: {self.current_mode}\n")
+            f.write(f"Semente: {self.session_seed}\n")
+            f.write(f"Formato da Sessão: {SESSION_FORMAT}\n")
             f.write("---\n")
 
     def load_previous_attempts(self):
         """Carrega tentativas anteriores de um único arquivo."""
         attempts = []
-        if os.path.exists("quiz_attempts.txt"):
-            try:
-                with open("quiz_attempts.txt", "r") as f:
-                    lines = f.read().split("---\n")
-                    for attempt in lines:
-                        if attempt.strip():
-                            data = attempt.split("\n")
-                            timestamp = data[0].split(": ")[1].strip()
-                            percentage = float(data[2].split(": ")[1].strip().rstrip("%"))
-                            attempts.append((timestamp, percentage))
-            except Exception as e:
-                messagebox.showerror("Erro!", f"Erro ao carregar tentativas: {e}")
+        try:
+            for record in read_attempt_records():
+                percentage = float(record["Porcentagem"].rstrip("%"))
+                attempts.append((record["Data"], percentage))
+        except Exception as e:
+            messagebox.showerror("Erro!", f"Erro ao carregar tentativas: {e}")
         return sorted(attempts, key=lambda x: x[0])
 
     def show_stats(self):
         """Exibe estatísticas dentro da janela principal."""
+        self.ensure_attempts_loaded()
         self.clear_frame()
         self.main_frame = ttk.Frame(self.root, padding="20")
         self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -589,7 +801,7 @@ class QuizApp:
         self.stats_text_label = ttk.Label(frame, text=stats_text, justify="center")
         self.stats_text_label.grid(row=0, column=0, pady=10)
 
-        if self.attempts:
+        if self.attempts and self.load_chart_support():
             fig, ax = plt.subplots(figsize=(5, 3))
             dates, scores = zip(*self.attempts)
             ax.plot(range(len(scores)), scores, 'o-', color=self.colors['dark_purple'], 
@@ -603,12 +815,23 @@ class QuizApp:
             canvas = FigureCanvasTkAgg(fig, master=frame)
             canvas.draw()
             canvas.get_tk_widget().grid(row=1, column=0, pady=20, sticky=(tk.W, tk.E))
+        elif self.attempts:
+            ttk.Label(frame, text="Gráfico indisponível.", justify="center").grid(row=1, column=0, pady=20)
         else:
             ttk.Label(frame, text="Nenhuma tentativa ainda!", justify="center").grid(row=1, column=0, pady=20)
 
         self.update_sizes()
         self.showing_stats = True
 
+    def load_chart_support(self):
+        """Carrega o matplotlib para o gráfico, avisando o usuário se não for possível."""
+        try:
+            load_plotting()
+            return True
+        except Exception as e:
+            messagebox.showerror("Erro!", f"Não consegui carregar o matplotlib para o gráfico: {e}")
+            return False
+
     # Leitura de PDFs
     def show_pdf_list(self):
         """Lista PDFs com 'quiz' no nome na mesma janela."""
@@ -666,6 +889,7 @@ class QuizApp:
             if os.name == 'nt':  # Windows
                 os.startfile(pdf_path)
             elif os.name == 'posix':  # macOS/Linux
+                import subprocess
                 opener = "open" if sys.platform == "darwin" else "xdg-open"
                 subprocess.call([opener, pdf_path])
             else:
@@ -673,9 +897,44 @@ class QuizApp:
         except Exception as e:
             messagebox.showerror("Erro!", f"Não consegui abrir o PDF: {e}. Verifique se o arquivo existe ou se está corrompido.")
 
+def replay_attempt(timestamp):
+    """Imprime a ordem das perguntas da tentativa salva com a data informada."""
+    records = [r for r in read_attempt_records() if r.get("Data") == timestamp]
+    if not records:
+        print(f"Nenhuma tentativa encontrada com a data '{timestamp}'.")
+        return 1
+    try:
+        questions = rebuild_session(records[-1])
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Não foi possível reconstruir a tentativa: {e}")
+        return 1
+    for i, q in enumerate(questions, 1):
+        print(f"Pergunta {i}: {q['question']}")
+    return 0
+
 def main():
+    args = sys.argv[1:]
+    if "--replay-attempt" in args:
+        index = args.index("--replay-attempt") + 1
+        if index >= len(args):
+            print("Uso: quiz_app.py --replay-attempt AAAAMMDD_HHMMSS")
+            sys.exit(2)
+        sys.exit(replay_attempt(args[index]))
+
+    fixed_seed = None
+    if "--seed" in args:
+        index = args.index("--seed") + 1
+        try:
+            fixed_seed = int(args[index])
+        except (IndexError, ValueError):
+            print("Uso: quiz_app.py --seed NÚMERO")
+            sys.exit(2)
+
+    profile_startup = "--profile-startup" in args
+    start = time.perf_counter()
     root = tk.Tk()
-    app = QuizApp(root)
+    record_timing("Criação da janela (Tk)", start)
+    app = QuizApp(root, profile_startup=profile_startup, fixed_seed=fixed_seed)
     root.mainloop()
 
 if __name__ == "__main__":